@@ -0,0 +1,68 @@
+"""
+Shared helpers for the Python hooks: input parsing and stderr output.
+
+Conventions the hooks follow:
+
+- Each hook lowercases the command or path once and writes its patterns in
+  lowercase, so no regex needs re.IGNORECASE case folding.
+- Related patterns are fused into one alternation, so a check is one scan.
+- Messages are built in full (module-level templates) and written with a
+  single emit() call.
+"""
+import json
+import os
+import sys
+
+BANNER_RULE = "=" * 70
+
+
+def parse_input(raw):
+    """Decode a raw payload; raises json.JSONDecodeError if it is invalid."""
+    return json.loads(raw)
+
+
+def load_input(raw=None):
+    """
+    Parse the hook's JSON payload, read from stdin if not given.
+
+    Returns the decoded object, or None after reporting a parse error (the
+    hook should then exit 1).
+    """
+    if raw is None:
+        raw = sys.stdin.buffer.read()
+    try:
+        return parse_input(raw)
+    except json.JSONDecodeError as e:
+        emit(f"Error parsing JSON input: {e}\n")
+        return None
+
+
+def run_check(check, raw=None):
+    """
+    Run a hook's check() on a JSON payload, read from stdin if not given.
+
+    Writes the check's message to stderr and returns its exit code, or 1
+    after reporting a parse error.
+    """
+    input_data = load_input(raw)
+    if input_data is None:
+        return 1
+
+    code, message = check(input_data)
+    if message:
+        emit(message)
+    return code
+
+
+def emit(text):
+    """Write text to stderr with os.write, bypassing the buffered IO layer."""
+    # Anything already printed through sys.stderr must come out first
+    sys.stderr.flush()
+    buf = text.encode("utf-8", "replace")
+    while buf:
+        buf = buf[os.write(2, buf) :]
+
+
+def banner(title, body):
+    """Frame a message with rule lines, with the title in a header."""
+    return f"\n{BANNER_RULE}\n{title}\n{BANNER_RULE}\n\n{body}\n{BANNER_RULE}\n\n"
@@ -6,25 +6,35 @@ Runs appropriate formatter based on file extension.
 import json
 import sys
 import os
-import subprocess
-import shutil
+import re
+import time
+
+from _common import load_input
+
+# subprocess, shutil and tempfile are imported where they are used: most
+# edits exit before formatting, and those imports dominate startup.
 
 # Formatter configuration: extension -> (formatter_cmd, args)
-FORMATTERS = {
-    ".ts": ("npx", ["prettier", "--write"]),
-    ".tsx": ("npx", ["prettier", "--write"]),
-    ".js": ("npx", ["prettier", "--write"]),
-    ".jsx": ("npx", ["prettier", "--write"]),
-    ".json": ("npx", ["prettier", "--write"]),
-    ".css": ("npx", ["prettier", "--write"]),
-    ".scss": ("npx", ["prettier", "--write"]),
-    ".md": ("npx", ["prettier", "--write"]),
-    ".yaml": ("npx", ["prettier", "--write"]),
-    ".yml": ("npx", ["prettier", "--write"]),
-    ".go": ("gofmt", ["-w"]),
-    ".py": ("black", []),
+# prettier is resolved by resolve_prettier() rather than run through npx
+_FORMATTERS = {
+    ".ts": ("prettier", ("--write",)),
+    ".tsx": ("prettier", ("--write",)),
+    ".js": ("prettier", ("--write",)),
+    ".jsx": ("prettier", ("--write",)),
+    ".json": ("prettier", ("--write",)),
+    ".css": ("prettier", ("--write",)),
+    ".scss": ("prettier", ("--write",)),
+    ".md": ("prettier", ("--write",)),
+    ".yaml": ("prettier", ("--write",)),
+    ".yml": ("prettier", ("--write",)),
+    ".go": ("gofmt", ("-w",)),
+    ".py": ("black", ()),
 }
 
+# Interned keys; the looked-up extension is interned too, so the dict
+# lookup matches by identity
+FORMATTERS = {sys.intern(ext): formatter for ext, formatter in _FORMATTERS.items()}
+
 # Files/paths to skip
 SKIP_PATTERNS = [
     "node_modules",
@@ -36,63 +46,220 @@ SKIP_PATTERNS = [
     "build",
 ]
 
-try:
-    input_data = json.load(sys.stdin)
-except json.JSONDecodeError as e:
-    print(f"Error parsing JSON input: {e}", file=sys.stderr)
-    sys.exit(1)
+# All skip patterns as one alternation, so a path is scanned once
+SKIP_RE = re.compile("|".join(map(re.escape, SKIP_PATTERNS)))
+
+# Formatter lookups cached across hook invocations (keyed by $PATH)
+FORMATTER_CACHE = os.path.expanduser("~/.cache/claude-hooks/formatters.json")
+
+# Formatters recorded as missing are looked up again after this many seconds
+MISSING_TTL = 3600
+
+
+def load_formatter_cache():
+    """Load the formatter cache, discarding it if $PATH has changed."""
+    path_key = os.environ.get("PATH", "")
+    try:
+        with open(FORMATTER_CACHE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = None
+
+    if (
+        not isinstance(cache, dict)
+        or cache.get("path") != path_key
+        or not isinstance(cache.get("bins"), dict)
+        or not isinstance(cache.get("prettier"), dict)
+    ):
+        cache = {"path": path_key, "bins": {}, "prettier": {}}
+    return cache
+
+
+def save_formatter_cache(cache):
+    """Atomically write the formatter cache; failures are ignored."""
+    import tempfile
+
+    cache_dir = os.path.dirname(FORMATTER_CACHE)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=cache_dir, delete=False) as f:
+            json.dump(cache, f)
+        os.replace(f.name, FORMATTER_CACHE)
+    except OSError:
+        pass
 
-tool_name = input_data.get("tool_name", "")
-file_path = input_data.get("tool_input", {}).get("file_path", "")
 
-# Only process Edit and Write tool results
-if tool_name not in ("Edit", "Write") or not file_path:
-    sys.exit(0)
+def resolve_formatter(cache, name):
+    """
+    Return the path of a formatter executable, or None if not installed.
 
-# Skip certain paths
-for pattern in SKIP_PATTERNS:
-    if pattern in file_path:
-        sys.exit(0)
+    shutil.which() stats every $PATH entry and each hook call is a fresh
+    process, so results are cached on disk. Cached paths are re-checked
+    with a single os.access(); missing formatters expire after MISSING_TTL.
+    """
+    entry = cache["bins"].get(name)
+    if isinstance(entry, list) and len(entry) == 2:
+        resolved, checked = entry
+        if resolved and os.access(resolved, os.X_OK):
+            return resolved
+        if not resolved and time.time() - checked < MISSING_TTL:
+            return None
 
-# Check if file exists
-if not os.path.exists(file_path):
-    sys.exit(0)
+    import shutil
 
-# Get file extension
-_, ext = os.path.splitext(file_path)
-ext = ext.lower()
+    resolved = shutil.which(name)
+    cache["bins"][name] = [resolved, time.time()]
+    save_formatter_cache(cache)
+    return resolved
 
-# Check if we have a formatter for this extension
-if ext not in FORMATTERS:
-    sys.exit(0)
 
-formatter_cmd, args = FORMATTERS[ext]
+def resolve_prettier(cache, file_path):
+    """
+    Return the command prefix for running prettier, or None if unavailable.
 
-# Check if formatter is available
-if not shutil.which(formatter_cmd):
-    # Formatter not installed, skip silently
-    sys.exit(0)
+    npx spends hundreds of milliseconds on package lookup before prettier
+    even starts, so prefer the nearest node_modules/.bin/prettier above the
+    file (cached per directory), then a global prettier, and only then npx.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    local = cache["prettier"].get(directory)
+    if local and os.access(local, os.X_OK):
+        return (local,)
 
-# Run formatter
-try:
-    cmd = [formatter_cmd] + args + [file_path]
+    current = directory
+    while True:
+        candidate = os.path.join(current, "node_modules", ".bin", "prettier")
+        if os.access(candidate, os.X_OK):
+            cache["prettier"][directory] = candidate
+            save_formatter_cache(cache)
+            return (candidate,)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+
+    global_prettier = resolve_formatter(cache, "prettier")
+    if global_prettier:
+        return (global_prettier,)
+
+    npx = resolve_formatter(cache, "npx")
+    if npx:
+        return (npx, "prettier")
+    return None
+
+
+def run_formatter(cmd):
+    """Run a formatter that rewrites the file in place."""
+    import subprocess
+
+    # Only stderr is ever reported; stdout (prettier lists every file it
+    # wrote) is discarded, and stderr is decoded only on failure.
     result = subprocess.run(
         cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=30
+    )
+    if result.returncode == 0:
+        return 0, ""
+    return result.returncode, result.stderr.decode("utf-8", "replace")
+
+
+def run_prettierd(prettierd, file_path):
+    """
+    Format a file through prettierd (@fsouza/prettierd).
+
+    prettierd keeps prettier and its plugins loaded in a background daemon
+    (started on first use), so each file costs a round-trip to that daemon
+    instead of a fresh node + prettier load. It formats stdin to stdout, so
+    the file is only rewritten when the output differs.
+    """
+    import subprocess
+
+    with open(file_path, "rb") as f:
+        source = f.read()
+
+    result = subprocess.run(
+        [prettierd, file_path],
+        input=source,
         capture_output=True,
-        text=True,
         timeout=30
     )
+    if result.returncode == 0 and result.stdout and result.stdout != source:
+        with open(file_path, "wb") as f:
+            f.write(result.stdout)
+    return result.returncode, result.stderr.decode("utf-8", "replace")
 
-    if result.returncode == 0:
-        print(f"Formatted: {file_path}")
+
+def main(raw=None):
+    """Run the hook on a JSON payload, read from stdin if not given."""
+    input_data = load_input(raw)
+    if input_data is None:
+        return 1
+
+    tool_name = input_data.get("tool_name", "")
+    file_path = input_data.get("tool_input", {}).get("file_path", "")
+
+    # Only process Edit and Write tool results
+    if tool_name not in ("Edit", "Write") or not file_path:
+        return 0
+
+    # Skip certain paths
+    if SKIP_RE.search(file_path):
+        return 0
+
+    # Check if file exists
+    if not os.path.exists(file_path):
+        return 0
+
+    # Get file extension
+    _, ext = os.path.splitext(file_path)
+    ext = sys.intern(ext.lower())
+
+    # Check if we have a formatter for this extension
+    if ext not in FORMATTERS:
+        return 0
+
+    formatter_cmd, args = FORMATTERS[ext]
+
+    import subprocess
+
+    # Check if formatter is available
+    cache = load_formatter_cache()
+    prettierd = None
+    if formatter_cmd == "prettier":
+        # A running prettier daemon beats any per-file prettier process
+        prettierd = resolve_formatter(cache, "prettierd")
+        command_prefix = None if prettierd else resolve_prettier(cache, file_path)
     else:
-        # Formatter failed, but don't block
-        print(f"Format warning: {result.stderr}", file=sys.stderr)
+        formatter_path = resolve_formatter(cache, formatter_cmd)
+        command_prefix = (formatter_path,) if formatter_path else None
+
+    if not prettierd and not command_prefix:
+        # Formatter not installed, skip silently
+        return 0
+
+    # Run formatter
+    try:
+        if prettierd:
+            returncode, stderr = run_prettierd(prettierd, file_path)
+        else:
+            returncode, stderr = run_formatter((*command_prefix, *args, file_path))
+
+        if returncode == 0:
+            print(f"Formatted: {file_path}")
+        else:
+            # Formatter failed, but don't block
+            print(f"Format warning: {stderr}", file=sys.stderr)
+
+    except subprocess.TimeoutExpired:
+        print(f"Format timeout: {file_path}", file=sys.stderr)
+    except Exception as e:
+        print(f"Format error: {e}", file=sys.stderr)
+
+    # Always exit successfully - formatting is best-effort
+    return 0
 
-except subprocess.TimeoutExpired:
-    print(f"Format timeout: {file_path}", file=sys.stderr)
-except Exception as e:
-    print(f"Format error: {e}", file=sys.stderr)
 
-# Always exit successfully - formatting is best-effort
-sys.exit(0)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env bash
+# claude-hooks-client.sh - Run a hook through the hook server if it is up
+#
+# Sends the payload to `python3 -m claude_hooks.server` over its Unix socket
+# and replays the verdict (stderr message + exit code). When the server is
+# not running, nc or timeout is missing, the server declines the target or
+# does not answer within SERVER_TIMEOUT seconds, the hook runs in-process
+# through `python3 -m claude_hooks` instead, so a hung server cannot make
+# the blocking hooks fail open.
+#
+# Usage: hooks/claude-hooks-client.sh <bash|kubectl|protect-files|...>
+
+set -uo pipefail
+
+HOOKS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SOCKET="${XDG_RUNTIME_DIR:-/tmp}/claude-hooks-$(id -u).sock"
+TARGET="${1:-}"
+SERVER_TIMEOUT=2
+
+PAYLOAD="$(mktemp)"
+REPLY="$(mktemp)"
+trap 'rm -f "$PAYLOAD" "$REPLY"' EXIT
+cat > "$PAYLOAD"
+
+# Only a socket owned by this user is trusted with payloads and verdicts
+if [[ -n "$TARGET" && -S "$SOCKET" && -O "$SOCKET" ]] \
+    && command -v nc >/dev/null 2>&1 && command -v timeout >/dev/null 2>&1; then
+    SIZE=$(wc -c < "$PAYLOAD")
+    { printf '%s %d\n' "$TARGET" "$SIZE"; cat "$PAYLOAD"; } \
+        | timeout "$SERVER_TIMEOUT" nc -U "$SOCKET" > "$REPLY" 2>/dev/null
+    CODE="$(head -n 1 "$REPLY")"
+    if [[ "$CODE" =~ ^[0-9]+$ ]]; then
+        tail -n +2 "$REPLY" >&2
+        exit "$CODE"
+    fi
+fi
+
+# Bytecode precompiled by install.sh; set for the hook process only
+PYTHONPYCACHEPREFIX="$HOME/.cache/claude-hooks/pyc" \
+    PYTHONPATH="$HOOKS_DIR${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 -m claude_hooks "$TARGET" < "$PAYLOAD"
@@ -0,0 +1,110 @@
+"""
+Single-process dispatcher for the Python hooks.
+
+Every hook script pays for its own interpreter start and imports. Running
+them through one process means that cost is paid once per tool call, even
+when several hooks fire for the same command:
+
+    python3 -m claude_hooks bash           # every Bash hook, one process
+    python3 -m claude_hooks kubectl        # a single hook
+
+Run from the hooks directory, or set PYTHONPATH to it. The standalone
+scripts keep working unchanged.
+"""
+import importlib.util
+import os
+import sys
+
+from _common import run_check
+
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hook name -> script in HOOKS_DIR
+HOOKS = {
+    "auto-format": "auto-format.py",
+    "branch-prefix": "enforce-branch-prefix.py",
+    "kubectl": "enforce-gitops-kubectl.py",
+    "protect-files": "protect-files.py",
+    "safe-commit": "enforce-safe-commit.py",
+    "safe-destroy": "enforce-safe-destroy.py",
+}
+
+# Hooks that share a matcher, run in order on the same payload
+GROUPS = {
+    "bash": ("kubectl", "branch-prefix", "safe-destroy", "safe-commit"),
+}
+
+USAGE = "usage: python3 -m claude_hooks <{}>\n".format(
+    "|".join(sorted([*HOOKS, *GROUPS]))
+)
+
+
+def load_hook(name):
+    """Import a hook script by name (the script names are not identifiers)."""
+    module_name = "claude_hooks." + name.replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is None:
+        path = os.path.join(HOOKS_DIR, HOOKS[name])
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+    return module
+
+
+def hook_names(target):
+    """Return the hooks a group or hook name stands for, or None."""
+    if target in GROUPS:
+        return GROUPS[target]
+    if target in HOOKS:
+        return (target,)
+    return None
+
+
+def check(names, input_data):
+    """
+    Run the check() of each hook on a decoded payload.
+
+    Returns (exit code, stderr message) with the same early stop as run().
+    Only hooks that define check() can be used (auto-format does not).
+    """
+    messages = []
+    for name in names:
+        code, message = load_hook(name).check(input_data)
+        messages.append(message)
+        if code:
+            return code, "".join(messages)
+    return 0, "".join(messages)
+
+
+def run(names, raw):
+    """
+    Run hooks in order on one payload and return the resulting exit code.
+
+    The first non-zero exit code (1 for bad input, 2 to block) stops the run;
+    the hooks after it would only repeat the error or warn about a command
+    that is not going to run.
+    """
+    for name in names:
+        hook = load_hook(name)
+        if hasattr(hook, "check"):
+            code = run_check(hook.check, raw)
+        else:
+            code = hook.main(raw)
+        if code:
+            return code
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        sys.stderr.write(USAGE)
+        return 1
+
+    names = hook_names(argv[0])
+    if names is None:
+        sys.stderr.write(USAGE)
+        return 1
+
+    return run(names, sys.stdin.buffer.read())
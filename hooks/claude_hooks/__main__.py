@@ -0,0 +1,5 @@
+import sys
+
+from claude_hooks import main
+
+sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Long-lived hook server on a Unix socket.
+
+Even through the dispatcher, every tool call still starts an interpreter
+and imports the hooks. The server does that once and then answers each
+call from memory; hooks/claude-hooks-client.sh sends it the payload.
+
+    PYTHONPATH=hooks python3 -m claude_hooks.server &
+
+Connections are served on their own threads, and a client that stalls
+mid-request is dropped after CLIENT_TIMEOUT seconds, so one stuck
+connection cannot hold up the others.
+
+Protocol, one request per connection:
+
+    request:  "<target> <nbytes>\\n" followed by nbytes of JSON payload
+    reply:    "<exit code>\\n" followed by the stderr message
+
+A target the server cannot check in-process (auto-format, or an unknown
+name) gets no reply at all, and the client falls back to running
+`python3 -m claude_hooks <target>` itself.
+"""
+import json
+import os
+import socketserver
+import stat
+import sys
+
+from _common import parse_input
+from claude_hooks import HOOKS, check, hook_names, load_hook
+
+# In the per-user runtime directory when there is one; under /tmp the
+# client only trusts a socket owned by the same user
+SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or "/tmp", f"claude-hooks-{os.getuid()}.sock"
+)
+
+# Largest payload accepted; anything bigger is left to the fallback
+MAX_PAYLOAD = 16 * 1024 * 1024
+
+# Seconds a connection may go without sending before it is dropped
+CLIENT_TIMEOUT = 2
+
+
+def checkable(names):
+    """True if every hook in names can run in-process (has a check())."""
+    return all(hasattr(load_hook(name), "check") for name in names)
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+    timeout = CLIENT_TIMEOUT
+
+    def handle(self):
+        try:
+            request = self.read_request()
+        except TimeoutError:
+            return
+        if request is None:
+            return
+
+        names, raw = request
+
+        try:
+            code, message = check(names, parse_input(raw))
+        except json.JSONDecodeError as e:
+            code, message = 1, f"Error parsing JSON input: {e}\n"
+        self.wfile.write(f"{code}\n{message}".encode("utf-8", "replace"))
+
+    def read_request(self):
+        """Read one request; returns (names, payload), or None to decline it."""
+        header = self.rfile.readline(256).split()
+        if len(header) != 2 or not header[1].isdigit():
+            return None
+        target, size = header[0].decode("utf-8", "replace"), int(header[1])
+        names = hook_names(target)
+        if names is None or size > MAX_PAYLOAD or not checkable(names):
+            return None
+
+        raw = self.rfile.read(size)
+        if len(raw) != size:
+            return None
+        return names, raw
+
+
+class HookServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        # Replace a stale socket of ours, but never anything another user
+        # put at the path; keep the new one private to this user
+        try:
+            st = os.lstat(self.server_address)
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+                raise PermissionError(
+                    f"{self.server_address} exists and is not our socket"
+                )
+            os.unlink(self.server_address)
+        old_umask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else SOCKET_PATH
+
+    # Import every checker up front so no request pays for it
+    for name in HOOKS:
+        load_hook(name)
+
+    try:
+        server = HookServer(path, HookHandler)
+    except OSError as e:
+        print(f"claude_hooks.server: {e}", file=sys.stderr)
+        return 1
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,64 +3,119 @@
 Hook: Enforce mriley/ branch prefix.
 Blocks branch creation without the required prefix.
 """
-import json
 import sys
-import re
+
+from _common import run_check
 
 REQUIRED_PREFIX = "mriley/"
 
-# Patterns for branch creation
-BRANCH_CREATE_PATTERNS = [
-    r'\bgit\s+checkout\s+-b\s+(\S+)',
-    r'\bgit\s+branch\s+(?!-[dD])\s*(\S+)',
-    r'\bgit\s+switch\s+-c\s+(\S+)',
-]
+# Flags that take the new branch name, per git subcommand (lowercase)
+CREATE_FLAGS = {
+    "checkout": frozenset(("-b",)),
+    "switch": frozenset(("-c", "--create")),
+}
+
+# `git branch` flags that never create a branch
+BRANCH_SKIP_FLAGS = frozenset((
+    "-d", "--delete",
+    "-l", "--list", "-a", "--all", "-r", "--remotes", "--show-current",
+))
+
+# `git branch` flags whose last argument is the new name
+BRANCH_RENAME_FLAGS = frozenset(("-m", "--move", "-c", "--copy"))
+
+# Tokens that end one shell command
+SEPARATORS = frozenset(("&&", "||", ";", "|", "&"))
+
+# {branch} is filled in at block time
+BLOCK_MESSAGE_TEMPLATE = """\
+BLOCKED: Branch name must start with 'mriley/'
+
+Invalid branch: {branch}
+Expected format: mriley/<type>/<description>
+
+Examples:
+  mriley/feat/new-feature
+  mriley/fix/bug-description
+  mriley/refactor/cleanup
+
+Use the manage-branch skill:
+  /manage-branch
+"""
 
 # Branches that don't need prefix
-ALLOWED_BRANCHES = [
+ALLOWED_BRANCHES = frozenset((
     "main",
     "master",
     "develop",
     "dev",
-]
+))
 
-try:
-    input_data = json.load(sys.stdin)
-except json.JSONDecodeError as e:
-    print(f"Error parsing JSON input: {e}", file=sys.stderr)
-    sys.exit(1)
 
-tool_name = input_data.get("tool_name", "")
-command = input_data.get("tool_input", {}).get("command", "")
+def find_new_branches(command, command_lower):
+    """
+    Yield every branch name the command creates, across all git invocations.
 
-# Only check Bash commands
-if tool_name != "Bash" or not command:
-    sys.exit(0)
+    Scans whitespace tokens for git checkout/switch/branch. Subcommands and
+    flags are compared lowercased; the names keep their original case.
+    """
+    tokens = command.split()
+    lowered = command_lower.split()
+    for i, token in enumerate(lowered[:-1]):
+        if token != "git" and not token.endswith("/git"):
+            continue
 
-# Check for branch creation patterns
-for pattern in BRANCH_CREATE_PATTERNS:
-    match = re.search(pattern, command, re.IGNORECASE)
-    if match:
-        branch_name = match.group(1)
+        subcommand = lowered[i + 1]
+        end = i + 2
+        while end < len(lowered) and lowered[end] not in SEPARATORS:
+            end += 1
 
+        if subcommand in CREATE_FLAGS:
+            flags = CREATE_FLAGS[subcommand]
+            for j in range(i + 2, end - 1):
+                if lowered[j] in flags:
+                    yield tokens[j + 1]
+                    break
+        elif subcommand == "branch":
+            args = lowered[i + 2 : end]
+            if BRANCH_SKIP_FLAGS.intersection(args):
+                continue
+            names = [j for j in range(i + 2, end) if not lowered[j].startswith("-")]
+            if names:
+                if BRANCH_RENAME_FLAGS.intersection(args):
+                    yield tokens[names[-1]]
+                else:
+                    yield tokens[names[0]]
+
+
+def check(input_data):
+    """Block branches created without REQUIRED_PREFIX; returns (exit code, message)."""
+    tool_name = input_data.get("tool_name", "")
+    command = input_data.get("tool_input", {}).get("command", "")
+
+    # Only check Bash commands
+    if tool_name != "Bash" or not command:
+        return 0, ""
+
+    # The branch name keeps its original case; only git tokens are lowercased
+    command_lower = command.lower()
+
+    # Fast path: branch creation always goes through git
+    if "git" not in command_lower:
+        return 0, ""
+
+    # Check every branch the command creates
+    for branch_name in find_new_branches(command, command_lower):
         # Skip allowed branches
         if branch_name in ALLOWED_BRANCHES:
-            sys.exit(0)
+            continue
 
         # Check for required prefix
         if not branch_name.startswith(REQUIRED_PREFIX):
-            print("BLOCKED: Branch name must start with 'mriley/'", file=sys.stderr)
-            print("", file=sys.stderr)
-            print(f"Invalid branch: {branch_name}", file=sys.stderr)
-            print(f"Expected format: mriley/<type>/<description>", file=sys.stderr)
-            print("", file=sys.stderr)
-            print("Examples:", file=sys.stderr)
-            print("  mriley/feat/new-feature", file=sys.stderr)
-            print("  mriley/fix/bug-description", file=sys.stderr)
-            print("  mriley/refactor/cleanup", file=sys.stderr)
-            print("", file=sys.stderr)
-            print("Use the manage-branch skill:", file=sys.stderr)
-            print("  /manage-branch", file=sys.stderr)
-            sys.exit(2)
-
-sys.exit(0)
+            return 2, BLOCK_MESSAGE_TEMPLATE.format(branch=branch_name)
+
+    return 0, ""
+
+
+if __name__ == "__main__":
+    sys.exit(run_check(check))
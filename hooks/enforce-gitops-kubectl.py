@@ -5,319 +5,306 @@ Hard blocks all kubectl mutation commands, requires GitOps workflow.
 Exit code 2 = BLOCK (mutation detected)
 Exit code 0 = ALLOW (read-only or dry-run)
 """
-import json
 import sys
 import re
 
+from _common import banner, run_check
+
 # ============================================================================
 # KUBECTL MUTATION COMMANDS - BLOCK THESE
 # ============================================================================
 
 # Primary mutation verbs that modify cluster state
-MUTATION_VERBS = [
-    r"\bapply\b",
-    r"\bcreate\b",
-    r"\bedit\b",
-    r"\bpatch\b",
-    r"\bdelete\b",
-    r"\breplace\b",
-    r"\bscale\b",
-    r"\bautoscale\b",
-    r"\brollout\s+(restart|undo|pause|resume)\b",
-    r"\bset\b",  # set image, set resources, set env, etc.
-    r"\blabel\b",
-    r"\bannotate\b",
-    r"\bexpose\b",
-    r"\brun\b",
-    r"\bdrain\b",
-    r"\bcordon\b",
-    r"\buncordon\b",
-    r"\btaint\b",
-    r"\battach\b",
-    r"\bexec\b",  # Can modify container state
-    r"\bcp\b",  # Can modify files in containers
-    r"\bport-forward\b",  # Can be used for state modification
-]
-
-# Secondary mutation patterns (imperative operations)
-IMPERATIVE_PATTERNS = [
-    r"\bkubectl\s+.*--force\b",  # Force operations
-    r"\bkubectl\s+.*--grace-period=0\b",  # Immediate deletion
-    r"\bkubectl\s+.*--now\b",  # Immediate operations
-]
+MUTATION_VERBS = (
+    "apply",
+    "create",
+    "edit",
+    "patch",
+    "delete",
+    "replace",
+    "scale",
+    "autoscale",
+    r"rollout\s+(?:restart|undo|pause|resume)",
+    "set",  # set image, set resources, set env, etc.
+    "label",
+    "annotate",
+    "expose",
+    "run",
+    "drain",
+    "cordon",
+    "uncordon",
+    "taint",
+    "attach",
+    "exec",  # Can modify container state
+    "cp",  # Can modify files in containers
+    "port-forward",  # Can be used for state modification
+)
+
+# Secondary mutation flags (imperative operations)
+IMPERATIVE_FLAGS = (
+    "--force",  # Force operations
+    "--grace-period=0",  # Immediate deletion
+    "--now",  # Immediate operations
+)
 
 # ============================================================================
 # READ-ONLY COMMANDS - ALLOW THESE
 # ============================================================================
 
-READ_ONLY_VERBS = [
-    r"\bget\b",
-    r"\bdescribe\b",
-    r"\blogs\b",
-    r"\bexplain\b",
-    r"\bdiff\b",
-    r"\bapi-resources\b",
-    r"\bapi-versions\b",
-    r"\bversion\b",
-    r"\bcluster-info\b",
-    r"\btop\b",
-    r"\bauth\s+can-i\b",
-    r"\bconfig\s+view\b",  # View config only
-    r"\brollout\s+status\b",  # Status check only
-    r"\brollout\s+history\b",  # History view only
-    r"\bwait\b",  # Wait for condition (read-only)
-]
+READ_ONLY_VERBS = (
+    "get",
+    "describe",
+    "logs",
+    "explain",
+    "diff",
+    "api-resources",
+    "api-versions",
+    "version",
+    "cluster-info",
+    "top",
+    r"auth\s+can-i",
+    r"config\s+view",  # View config only
+    r"rollout\s+status",  # Status check only
+    r"rollout\s+history",  # History view only
+    "wait",  # Wait for condition (read-only)
+)
 
 # ============================================================================
 # DRY-RUN PATTERNS - ALLOW THESE
 # ============================================================================
 
-DRY_RUN_PATTERNS = [
-    r"--dry-run\b",
-    r"--dry-run=client\b",
-    r"--dry-run=server\b",
-]
+# Covers --dry-run, --dry-run=client and --dry-run=server
+DRY_RUN_PATTERN = r"--dry-run\b"
 
 # ============================================================================
 # ARGOCD BOOTSTRAP DETECTION - SPECIAL HANDLING
 # ============================================================================
 
 # ArgoCD namespaces that indicate bootstrap scenario
-ARGOCD_NAMESPACES = ["argocd", "argo-cd", "argocd-system"]
+ARGOCD_NAMESPACES = frozenset(("argocd", "argo-cd", "argocd-system"))
+_ARGOCD_NS = "(?:" + "|".join(map(re.escape, sorted(ARGOCD_NAMESPACES))) + ")"
 
 # ArgoCD resource patterns (CRDs and namespace references)
-ARGOCD_PATTERNS = [
-    r"-n\s+(argocd|argo-cd|argocd-system)\b",  # -n argocd
-    r"--namespace[=\s]+(argocd|argo-cd|argocd-system)\b",  # --namespace argocd
+ARGOCD_PATTERNS = (
+    r"-n\s+" + _ARGOCD_NS + r"\b",  # -n argocd
+    r"--namespace[=\s]+" + _ARGOCD_NS + r"\b",  # --namespace argocd
     r"applications?\.argoproj\.io",  # ArgoCD Application CRDs
     r"applicationsets?\.argoproj\.io",  # ApplicationSet CRDs
     r"appprojects?\.argoproj\.io",  # AppProject CRDs
     r"argocd/",  # Path contains argocd/
-]
+)
 
 # ============================================================================
-# VALIDATION LOGIC
+# COMPILED MATCHERS
 # ============================================================================
 
+# One alternation per group; IMPERATIVE_RE runs on the whole command, the
+# others only on the parsed verb
+MUTATION_RE = re.compile(r"\b(?:" + "|".join(MUTATION_VERBS) + r")\b")
+IMPERATIVE_RE = re.compile(r"\bkubectl\s+.*(?:" + "|".join(IMPERATIVE_FLAGS) + r")\b")
+READ_ONLY_RE = re.compile(r"\b(?:" + "|".join(READ_ONLY_VERBS) + r")\b")
+DRY_RUN_RE = re.compile(DRY_RUN_PATTERN)
+ARGOCD_RE = re.compile("|".join(ARGOCD_PATTERNS))
 
-def is_kubectl_command(command: str) -> bool:
-    """Check if command is a kubectl command."""
-    # Match kubectl at start of command or after pipe/semicolon
-    return bool(re.search(r"(^|[|;&]\s*)kubectl\b", command, re.IGNORECASE))
+# ============================================================================
+# COMMAND PARSING
+# ============================================================================
 
+# kubectl at start of command or after pipe/semicolon
+KUBECTL_COMMAND = re.compile(r"(^|[|;&]\s*)kubectl\b")
+
+# Flags that consume the following token as their value (kubectl -n prod get)
+FLAGS_WITH_ARG = frozenset(
+    (
+        "-n",
+        "--namespace",
+        "--context",
+        "--cluster",
+        "--user",
+        "--kubeconfig",
+        "-s",
+        "--server",
+        "--token",
+        "--as",
+        "--as-group",
+        "--as-uid",
+        "--request-timeout",
+        "--certificate-authority",
+        "--client-certificate",
+        "--client-key",
+        "--tls-server-name",
+        "--cache-dir",
+        "-v",
+        "--v",
+        "-f",
+        "--filename",
+        "-k",
+        "--kustomize",
+        "-l",
+        "--selector",
+        "-o",
+        "--output",
+        "-c",
+        "--container",
+    )
+)
 
-def is_dry_run(command: str) -> bool:
-    """Check if command uses dry-run flag."""
-    for pattern in DRY_RUN_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True
-    return False
 
+def parse_kubectl(command: str):
+    """
+    Extract the kubectl verb with its following word (e.g. "rollout undo").
 
-def is_read_only(command: str) -> bool:
-    """Check if command is read-only."""
-    # Extract the kubectl verb (first argument after kubectl)
-    # Match: kubectl [flags] <verb> [...]
-    # Handle both long flags (--flag) and short flags (-f)
-    verb_match = re.search(
-        r"\bkubectl\s+(?:(?:--?[^\s]+\s+)*)([a-z-]+)", command, re.IGNORECASE
-    )
-    if not verb_match:
-        return False
+    Expects the lowercased command. Returns None when the command is not a
+    kubectl command, and an empty string when kubectl is invoked without a
+    verb (e.g. `kubectl --help`).
+    """
+    match = KUBECTL_COMMAND.search(command)
+    if not match:
+        return None
 
-    verb_context = verb_match.group(0)  # Full match including kubectl
+    # Skip flags before the verb, including the value of flags that take one
+    tokens = command[match.end() :].split()
+    i = 0
+    while i < len(tokens) and tokens[i].startswith("-"):
+        i += 2 if tokens[i] in FLAGS_WITH_ARG else 1
+    return " ".join(tokens[i : i + 2])
 
-    # Check if any read-only verb matches
-    for verb_pattern in READ_ONLY_VERBS:
-        if re.search(verb_pattern, verb_context, re.IGNORECASE):
-            return True
 
-    return False
+# ============================================================================
+# BLOCK MESSAGES
+# ============================================================================
 
+# Banner bodies; {verb} is filled in at block time
+BLOCK_TITLE = "KUBECTL MUTATION BLOCKED - GITOPS REQUIRED"
+BLOCK_MESSAGE_TEMPLATE = """\
+Command: kubectl {verb}
 
-def is_mutation(command: str) -> bool:
-    """Check if command is a mutation operation."""
-    # Extract the kubectl verb area
-    # Handle both long flags (--flag) and short flags (-f)
-    verb_match = re.search(
-        r"\bkubectl\s+(?:(?:--?[^\s]+\s+)*)([a-z-]+(?:\s+[a-z-]+)?)",
-        command,
-        re.IGNORECASE,
-    )
-    if not verb_match:
-        return False
+Direct kubectl mutations are FORBIDDEN in this environment.
+All cluster changes MUST go through GitOps workflow.
 
-    verb_context = verb_match.group(0)
+WHY: GitOps ensures:
+  - Auditable change history (git log)
+  - Peer review (pull requests)
+  - Rollback capability (git revert)
+  - Disaster recovery (git clone)
+  - Infrastructure as Code (declarative manifests)
 
-    # Check mutation verbs
-    for verb_pattern in MUTATION_VERBS:
-        if re.search(verb_pattern, verb_context, re.IGNORECASE):
-            return True
+PROPER WORKFLOW:
+  1. Use the gitops-apply skill
+  2. Update manifest in git repository
+  3. Commit changes with conventional format
+  4. ArgoCD/Flux will sync to cluster
 
-    # Check imperative patterns on full command
-    for pattern in IMPERATIVE_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True
+To proceed with GitOps workflow, say:
+  'Use gitops-apply skill to make this change'
 
-    return False
+READ-ONLY OPERATIONS (allowed):
+  kubectl get, describe, logs, explain, diff, top, etc.
 
+DRY-RUN OPERATIONS (allowed):
+  kubectl apply --dry-run=client
+  kubectl create --dry-run=server
+"""
 
-def extract_verb(command: str) -> str:
-    """Extract the kubectl verb for error messages."""
-    # Handle both long flags (--flag) and short flags (-f)
-    match = re.search(
-        r"\bkubectl\s+(?:(?:--?[^\s]+\s+)*)([a-z-]+(?:\s+[a-z-]+)?)",
-        command,
-        re.IGNORECASE,
-    )
-    if match:
-        return match.group(1)
-    return "unknown"
+ARGOCD_TITLE = "ARGOCD BOOTSTRAP DETECTED - OVERRIDE AVAILABLE"
+ARGOCD_MESSAGE_TEMPLATE = """\
+Command: kubectl {verb}
+
+ArgoCD cannot sync itself - bootstrap exception applies.
+
+QUESTION: Is this a one-off or needed for future deployments?
 
+ONE-OFF (debugging, temporary, won't repeat):
+  Say "one-off bootstrap" to proceed with kubectl directly
 
-def is_argocd_bootstrap(command: str) -> bool:
-    """Check if command targets ArgoCD (bootstrap scenario)."""
-    for pattern in ARGOCD_PATTERNS:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True
-    return False
+RECOVERY-NEEDED (new clusters, disaster recovery, repeatable):
+  1. Add command to scripts/bootstrap.sh (initial setup)
+  2. Add command to scripts/bootstrap-idempotent.sh (re-runnable)
+  3. Commit the bootstrap script changes
+  4. Then say "bootstrap updated" to proceed with kubectl
+
+IDEMPOTENT PATTERN EXAMPLE:
+  kubectl apply -f argocd/install.yaml || true
+  kubectl wait --for=condition=available deployment/argocd-server \\
+    -n argocd --timeout=300s
+
+For detailed bootstrap workflow, see:
+  gitops-apply skill > references/BOOTSTRAP-WORKFLOW.md
+"""
+
+# ============================================================================
+# VALIDATION LOGIC
+# ============================================================================
+
+
+# Verdicts returned by validate()
+ALLOW = "allow"
+BLOCK = "block"
+ARGOCD = "argocd"
+
+
+def validate(cmd: str):
+    """
+    Classify a lowercased command; returns (verdict, verb).
+
+    The checks run in a fixed order on the same input, so they are inlined
+    here rather than split into one helper per check.
+    """
+    verb = parse_kubectl(cmd)
+
+    # Not kubectl, or kubectl without a verb (e.g. `kubectl --help`)
+    if not verb:
+        return ALLOW, ""
+
+    # Allow dry-run operations (planning/validation)
+    if DRY_RUN_RE.search(cmd):
+        return ALLOW, verb
+
+    # Allow read-only operations; anchored so only the verb itself (or
+    # verb + subverb) can match
+    if READ_ONLY_RE.match(verb):
+        return ALLOW, verb
+
+    # Block mutation verbs and imperative flags on the full command
+    if MUTATION_RE.search(verb) or IMPERATIVE_RE.search(cmd):
+        # ArgoCD bootstrap gets a special message with override option
+        if ARGOCD_RE.search(cmd):
+            return ARGOCD, verb
+        return BLOCK, verb
+
+    # Default: allow (conservative - only block known mutations)
+    return ALLOW, verb
 
 
 # ============================================================================
 # MAIN LOGIC
 # ============================================================================
 
-try:
-    input_data = json.load(sys.stdin)
-except json.JSONDecodeError as e:
-    print(f"Error parsing JSON input: {e}", file=sys.stderr)
-    sys.exit(1)
-
-tool_name = input_data.get("tool_name", "")
-command = input_data.get("tool_input", {}).get("command", "")
-
-# Only check Bash commands
-if tool_name != "Bash" or not command:
-    sys.exit(0)
-
-# Only check kubectl commands
-if not is_kubectl_command(command):
-    sys.exit(0)
-
-# Allow dry-run operations (planning/validation)
-if is_dry_run(command):
-    sys.exit(0)
-
-# Allow read-only operations
-if is_read_only(command):
-    sys.exit(0)
-
-# Block mutations
-if is_mutation(command):
-    verb = extract_verb(command)
-
-    # Check if this is an ArgoCD bootstrap scenario
-    if is_argocd_bootstrap(command):
-        # ArgoCD bootstrap - show special message with override option
-        print("", file=sys.stderr)
-        print("=" * 70, file=sys.stderr)
-        print("ARGOCD BOOTSTRAP DETECTED - OVERRIDE AVAILABLE", file=sys.stderr)
-        print("=" * 70, file=sys.stderr)
-        print("", file=sys.stderr)
-        print(f"Command: kubectl {verb}", file=sys.stderr)
-        print("", file=sys.stderr)
-        print(
-            "ArgoCD cannot sync itself - bootstrap exception applies.",
-            file=sys.stderr,
-        )
-        print("", file=sys.stderr)
-        print(
-            "QUESTION: Is this a one-off or needed for future deployments?",
-            file=sys.stderr,
-        )
-        print("", file=sys.stderr)
-        print("ONE-OFF (debugging, temporary, won't repeat):", file=sys.stderr)
-        print(
-            '  Say "one-off bootstrap" to proceed with kubectl directly',
-            file=sys.stderr,
-        )
-        print("", file=sys.stderr)
-        print(
-            "RECOVERY-NEEDED (new clusters, disaster recovery, repeatable):",
-            file=sys.stderr,
-        )
-        print(
-            "  1. Add command to scripts/bootstrap.sh (initial setup)", file=sys.stderr
-        )
-        print(
-            "  2. Add command to scripts/bootstrap-idempotent.sh (re-runnable)",
-            file=sys.stderr,
-        )
-        print("  3. Commit the bootstrap script changes", file=sys.stderr)
-        print(
-            '  4. Then say "bootstrap updated" to proceed with kubectl', file=sys.stderr
-        )
-        print("", file=sys.stderr)
-        print("IDEMPOTENT PATTERN EXAMPLE:", file=sys.stderr)
-        print("  kubectl apply -f argocd/install.yaml || true", file=sys.stderr)
-        print(
-            "  kubectl wait --for=condition=available deployment/argocd-server \\",
-            file=sys.stderr,
-        )
-        print("    -n argocd --timeout=300s", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("For detailed bootstrap workflow, see:", file=sys.stderr)
-        print(
-            "  gitops-apply skill > references/BOOTSTRAP-WORKFLOW.md", file=sys.stderr
-        )
-        print("", file=sys.stderr)
-        print("=" * 70, file=sys.stderr)
-        print("", file=sys.stderr)
+def check(input_data):
+    """Block kubectl mutations in a Bash payload; returns (exit code, message)."""
+    tool_name = input_data.get("tool_name", "")
+    command = input_data.get("tool_input", {}).get("command", "")
+
+    # Only check Bash commands
+    if tool_name != "Bash" or not command:
+        return 0, ""
+
+    cmd = command.lower()
+
+    # Fast path: most commands never mention kubectl
+    if "kubectl" not in cmd:
+        return 0, ""
+
+    verdict, verb = validate(cmd)
+    if verdict == ALLOW:
+        return 0, ""
+
+    if verdict == ARGOCD:
+        message = banner(ARGOCD_TITLE, ARGOCD_MESSAGE_TEMPLATE.format(verb=verb))
     else:
-        # Standard GitOps block message
-        print("", file=sys.stderr)
-        print("=" * 70, file=sys.stderr)
-        print("KUBECTL MUTATION BLOCKED - GITOPS REQUIRED", file=sys.stderr)
-        print("=" * 70, file=sys.stderr)
-        print("", file=sys.stderr)
-        print(f"Command: kubectl {verb}", file=sys.stderr)
-        print("", file=sys.stderr)
-        print(
-            "Direct kubectl mutations are FORBIDDEN in this environment.",
-            file=sys.stderr,
-        )
-        print("All cluster changes MUST go through GitOps workflow.", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("WHY: GitOps ensures:", file=sys.stderr)
-        print("  - Auditable change history (git log)", file=sys.stderr)
-        print("  - Peer review (pull requests)", file=sys.stderr)
-        print("  - Rollback capability (git revert)", file=sys.stderr)
-        print("  - Disaster recovery (git clone)", file=sys.stderr)
-        print("  - Infrastructure as Code (declarative manifests)", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("PROPER WORKFLOW:", file=sys.stderr)
-        print("  1. Use the gitops-apply skill", file=sys.stderr)
-        print("  2. Update manifest in git repository", file=sys.stderr)
-        print("  3. Commit changes with conventional format", file=sys.stderr)
-        print("  4. ArgoCD/Flux will sync to cluster", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("To proceed with GitOps workflow, say:", file=sys.stderr)
-        print("  'Use gitops-apply skill to make this change'", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("READ-ONLY OPERATIONS (allowed):", file=sys.stderr)
-        print(
-            "  kubectl get, describe, logs, explain, diff, top, etc.",
-            file=sys.stderr,
-        )
-        print("", file=sys.stderr)
-        print("DRY-RUN OPERATIONS (allowed):", file=sys.stderr)
-        print("  kubectl apply --dry-run=client", file=sys.stderr)
-        print("  kubectl create --dry-run=server", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("=" * 70, file=sys.stderr)
-        print("", file=sys.stderr)
-
-    sys.exit(2)  # EXIT CODE 2 = BLOCK
-
-# Default: allow (conservative - only block known mutations)
-sys.exit(0)
+        message = banner(BLOCK_TITLE, BLOCK_MESSAGE_TEMPLATE.format(verb=verb))
+    return 2, message  # EXIT CODE 2 = BLOCK
+
+
+if __name__ == "__main__":
+    sys.exit(run_check(check))
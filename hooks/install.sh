@@ -0,0 +1,23 @@
+#!/usr/bin/env bash
+# install.sh - Precompile the Python hooks into a fixed bytecode cache
+#
+# Every hook call is a fresh interpreter. Without a usable .pyc (e.g. when
+# __pycache__ next to the hooks is not writable) each module is recompiled
+# on every call. This compiles them once into a hooks-only bytecode prefix.
+#
+# The prefix is not exported from the shell profile, which would move the
+# bytecode cache of every Python program. claude-hooks-client.sh sets
+# PYTHONPYCACHEPREFIX for the hook process only. Bytecode is only reused
+# for imported modules, i.e. when hooks run through `python3 -m
+# claude_hooks`; a script run directly is always compiled.
+#
+# Usage: hooks/install.sh
+
+set -euo pipefail
+
+HOOKS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PYC_PREFIX="$HOME/.cache/claude-hooks/pyc"
+
+mkdir -p "$PYC_PREFIX"
+PYTHONPYCACHEPREFIX="$PYC_PREFIX" python3 -m compileall -q "$HOOKS_DIR"
+echo "Compiled hooks into $PYC_PREFIX"
@@ -3,79 +3,149 @@
 Hook: Protect sensitive files from accidental edits.
 Blocks modifications to .env files, lock files, and .git directory.
 """
-import json
 import sys
 import re
-import os
-
-# Protected file patterns
-PROTECTED_PATTERNS = [
-    # Environment files
-    (r"\.env($|\.)", "Environment files contain secrets"),
-    (r"\.env\.local$", "Local environment files contain secrets"),
-    (r"\.env\..*$", "Environment files contain secrets"),
-    # Lock files (auto-generated)
-    (r"package-lock\.json$", "Lock file is auto-generated"),
-    (r"yarn\.lock$", "Lock file is auto-generated"),
-    (r"pnpm-lock\.yaml$", "Lock file is auto-generated"),
-    (r"Cargo\.lock$", "Lock file is auto-generated"),
-    (r"poetry\.lock$", "Lock file is auto-generated"),
-    (r"go\.sum$", "Lock file is auto-generated"),
-    (r"Gemfile\.lock$", "Lock file is auto-generated"),
-    # Git internals
-    (r"\.git/", "Git internal files should not be edited"),
-    (r"\.git$", "Git internal files should not be edited"),
-    # Other sensitive files
-    (r"\.ssh/", "SSH keys are sensitive"),
-    (r"id_rsa", "SSH private keys are sensitive"),
-    (r"\.pem$", "Certificate files are sensitive"),
-    (r"\.key$", "Key files are sensitive"),
-]
-
-# Exceptions (patterns that are allowed despite matching above)
-ALLOWED_PATTERNS = [
-    r"\.env\.example$",
-    r"\.env\.sample$",
-    r"\.env\.template$",
-]
-
-try:
-    input_data = json.load(sys.stdin)
-except json.JSONDecodeError as e:
-    print(f"Error parsing JSON input: {e}", file=sys.stderr)
-    sys.exit(1)
-
-tool_name = input_data.get("tool_name", "")
-file_path = input_data.get("tool_input", {}).get("file_path", "")
-
-# Only check Edit and Write operations
-if tool_name not in ("Edit", "Write") or not file_path:
-    sys.exit(0)
-
-# Get just the filename/path components
-file_name = os.path.basename(file_path)
-
-# Check exceptions first
-for pattern in ALLOWED_PATTERNS:
-    if re.search(pattern, file_name, re.IGNORECASE):
-        sys.exit(0)
-    if re.search(pattern, file_path, re.IGNORECASE):
-        sys.exit(0)
-
-# Check protected patterns
-for pattern, reason in PROTECTED_PATTERNS:
-    if re.search(pattern, file_name, re.IGNORECASE) or re.search(
-        pattern, file_path, re.IGNORECASE
-    ):
-        print("BLOCKED: Protected file modification.", file=sys.stderr)
-        print("", file=sys.stderr)
-        print(f"File: {file_path}", file=sys.stderr)
-        print(f"Reason: {reason}", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("If you need to edit this file:", file=sys.stderr)
-        print("  1. Consider if it's truly necessary", file=sys.stderr)
-        print("  2. Edit manually outside of Claude", file=sys.stderr)
-        print("  3. Or request explicit override", file=sys.stderr)
-        sys.exit(2)
-
-sys.exit(0)
+
+from _common import run_check
+
+ENV_REASON = "Environment files contain secrets"
+LOCK_REASON = "Lock file is auto-generated"
+GIT_REASON = "Git internal files should not be edited"
+
+# Most protected files are fixed names, suffixes or path components, so they
+# are checked with dict/str operations; only .env needs a regex. Entries are
+# lowercase and matched against the lowercased path.
+
+# Lock files (auto-generated), by exact file name
+EXACT_NAMES = {
+    "package-lock.json": LOCK_REASON,
+    "yarn.lock": LOCK_REASON,
+    "pnpm-lock.yaml": LOCK_REASON,
+    "cargo.lock": LOCK_REASON,
+    "poetry.lock": LOCK_REASON,
+    "go.sum": LOCK_REASON,
+    "gemfile.lock": LOCK_REASON,
+}
+
+# Path suffixes
+SUFFIXES = (
+    (".git", GIT_REASON),
+    (".pem", "Certificate files are sensitive"),
+    (".key", "Key files are sensitive"),
+)
+
+
+def build_suffix_trie():
+    """
+    Build a trie over the reversed exact names and suffixes.
+
+    Each node maps a character to its child; a node that ends an entry also
+    holds (reason, exact) under the None key. Exact names only match a whole
+    file name, i.e. when the entry reaches the start of the path or a "/".
+    """
+    root = {}
+    entries = [(name, reason, True) for name, reason in EXACT_NAMES.items()]
+    entries += [(suffix, reason, False) for suffix, reason in SUFFIXES]
+    for text, reason, exact in entries:
+        node = root
+        for char in reversed(text):
+            node = node.setdefault(char, {})
+        node[None] = (reason, exact)
+    return root
+
+
+# All exact-name and suffix checks in one walk back from the end of the path
+SUFFIX_TRIE = build_suffix_trie()
+
+# Substrings anywhere in the path
+PATH_PARTS = (
+    (".git/", GIT_REASON),
+    (".ssh/", "SSH keys are sensitive"),
+    ("id_rsa", "SSH private keys are sensitive"),
+)
+
+# Environment files: .env at the end or followed by another extension. One
+# pattern covers .env, .env.local, prod.env and anything under .env.d/; it is
+# the only unanchored check, so it searches the whole path.
+ENV_RE = re.compile(r"\.env(?:$|\.)")
+
+# Exceptions (allowed despite matching above). Every one is anchored at the
+# end of the path, so one endswith() tests them all at a single position
+# instead of a regex search trying every start offset.
+ALLOWED_SUFFIXES = (
+    ".env.example",
+    ".env.sample",
+    ".env.template",
+)
+
+# {file_path} and {reason} are filled in at block time
+BLOCK_MESSAGE_TEMPLATE = """\
+BLOCKED: Protected file modification.
+
+File: {file_path}
+Reason: {reason}
+
+If you need to edit this file:
+  1. Consider if it's truly necessary
+  2. Edit manually outside of Claude
+  3. Or request explicit override
+"""
+
+
+def suffix_reason(path):
+    """Walk the lowercased path backwards through SUFFIX_TRIE."""
+    node = SUFFIX_TRIE
+    for i in range(len(path) - 1, -1, -1):
+        node = node.get(path[i])
+        if node is None:
+            return None
+        entry = node.get(None)
+        if entry:
+            reason, exact = entry
+            if not exact or i == 0 or path[i - 1] == "/":
+                return reason
+    return None
+
+
+def protection_reason(path):
+    """Return why a lowercased path is protected, or None if it may be edited."""
+    reason = suffix_reason(path)
+    if reason:
+        return reason
+
+    for part, reason in PATH_PARTS:
+        if part in path:
+            return reason
+
+    if ENV_RE.search(path):
+        return ENV_REASON
+
+    return None
+
+
+def check(input_data):
+    """Block Edit/Write on protected files; returns (exit code, message)."""
+    tool_name = input_data.get("tool_name", "")
+    file_path = input_data.get("tool_input", {}).get("file_path", "")
+
+    # Only check Edit and Write operations
+    if tool_name not in ("Edit", "Write") or not file_path:
+        return 0, ""
+
+    # The message shows the path as given; matching uses the lowercased copy
+    path = file_path.lower()
+
+    # Check exceptions first
+    if path.endswith(ALLOWED_SUFFIXES):
+        return 0, ""
+
+    # Check protected files
+    reason = protection_reason(path)
+    if reason:
+        return 2, BLOCK_MESSAGE_TEMPLATE.format(file_path=file_path, reason=reason)
+
+    return 0, ""
+
+
+if __name__ == "__main__":
+    sys.exit(run_check(check))
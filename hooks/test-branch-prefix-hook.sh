@@ -0,0 +1,62 @@
+#!/bin/bash
+# Test script for enforce-branch-prefix hook
+
+HOOK="/home/mriley/.claude/hooks/enforce-branch-prefix.py"
+
+test_command() {
+  local description="$1"
+  local command="$2"
+  local expected_exit="$3"
+
+  echo "{\"tool_name\": \"Bash\", \"tool_input\": {\"command\": \"$command\"}}" | \
+    uv run "$HOOK" 2>/dev/null
+
+  actual_exit=$?
+
+  if [ $actual_exit -eq $expected_exit ]; then
+    echo "✅ PASS: $description"
+  else
+    echo "❌ FAIL: $description (expected: $expected_exit, got: $actual_exit)"
+  fi
+}
+
+echo "======================================================================="
+echo "Testing Branch Prefix Hook"
+echo "======================================================================="
+echo ""
+
+echo "Testing UNPREFIXED branches (should block with exit 2)..."
+echo "-----------------------------------------------------------------------"
+test_command "Block checkout -b" "git checkout -b feature/login" 2
+test_command "Block switch -c" "git switch -c fix-typo" 2
+test_command "Block switch --create" "git switch --create fix-typo" 2
+test_command "Block branch" "git branch feature" 2
+test_command "Block branch rename" "git branch -m old-name new-name" 2
+test_command "Block wrong-case prefix" "git checkout -b MRILEY/feat/x" 2
+
+echo ""
+echo "Testing PREFIXED and ALLOWED branches (should allow with exit 0)..."
+echo "-----------------------------------------------------------------------"
+test_command "Allow prefixed checkout -b" "git checkout -b mriley/feat/login" 0
+test_command "Allow prefixed switch -c" "git switch -c mriley/fix/typo" 0
+test_command "Allow prefixed branch" "git branch mriley/refactor/cleanup" 0
+test_command "Allow main" "git checkout -b main" 0
+test_command "Allow develop" "git branch develop" 0
+test_command "Allow branch delete" "git branch -d feature" 0
+test_command "Allow branch list" "git branch --list" 0
+test_command "Allow plain checkout" "git checkout feature" 0
+
+echo ""
+echo "Testing MULTIPLE COMMANDS (every new branch is checked)..."
+echo "-----------------------------------------------------------------------"
+test_command "Block second of two creations" "git checkout -b mriley/a && git switch -c bad" 2
+test_command "Block after prefixed branch" "git branch mriley/x && git checkout -b y" 2
+test_command "Block after allowed branch" "git checkout -b main && git checkout -b feature" 2
+test_command "Block after semicolon" "git switch -c mriley/a; git branch bad" 2
+test_command "Allow all prefixed" "git checkout -b mriley/a && git switch -c mriley/b" 0
+test_command "Allow delete then prefixed" "git branch -d old && git checkout -b mriley/new" 0
+
+echo ""
+echo "======================================================================="
+echo "Test suite complete!"
+echo "======================================================================="
@@ -77,6 +77,16 @@ test_command "Short flags (mutation)" "kubectl -n prod scale deployment api --re
 test_command "Short flags (read-only)" "kubectl -n prod get svc" 0
 test_command "Non-kubectl command" "echo kubectl apply -f file.yaml" 0
 
+echo ""
+echo "Testing FLAG SKIPPING (verb found after global flags)..."
+echo "-----------------------------------------------------------------------"
+test_command "Flag value before rollout undo" "kubectl -n prod rollout undo deployment/api" 2
+test_command "Flag value that looks like a verb" "kubectl --context=get-cluster apply -f app.yaml" 2
+test_command "Verbosity value before delete" "kubectl -v 5 delete pod nginx" 2
+test_command "Separate flag value (read-only)" "kubectl --context prod get pods" 0
+test_command "Several flags (read-only)" "kubectl -o yaml -n prod describe pod nginx" 0
+test_command "Verbosity value before logs" "kubectl -v 5 logs nginx" 0
+
 echo ""
 echo "======================================================================="
 echo "Test suite complete!"
@@ -0,0 +1,78 @@
+#!/bin/bash
+# Test script for protect-files hook
+
+HOOK="/home/mriley/.claude/hooks/protect-files.py"
+
+test_file() {
+  local description="$1"
+  local file_path="$2"
+  local expected_exit="$3"
+
+  echo "{\"tool_name\": \"Edit\", \"tool_input\": {\"file_path\": \"$file_path\"}}" | \
+    uv run "$HOOK" 2>/dev/null
+
+  actual_exit=$?
+
+  if [ $actual_exit -eq $expected_exit ]; then
+    echo "✅ PASS: $description"
+  else
+    echo "❌ FAIL: $description (expected: $expected_exit, got: $actual_exit)"
+  fi
+}
+
+echo "======================================================================="
+echo "Testing Protect Files Hook"
+echo "======================================================================="
+echo ""
+
+echo "Testing LOCK FILES (exact file names)..."
+echo "-----------------------------------------------------------------------"
+test_file "Block yarn.lock" "/a/yarn.lock" 2
+test_file "Block bare yarn.lock" "yarn.lock" 2
+test_file "Block package-lock.json" "/a/package-lock.json" 2
+test_file "Block Cargo.lock (any case)" "/a/Cargo.lock" 2
+test_file "Block go.sum" "/a/go.sum" 2
+test_file "Allow name ending in yarn.lock" "/a/xyarn.lock" 0
+test_file "Allow name ending in package-lock.json" "/a/my-package-lock.json" 0
+test_file "Allow dotted prefix before yarn.lock" "/a/my.yarn.lock" 0
+test_file "Allow lock name as a directory" "/a/yarn.lock/notes.md" 0
+
+echo ""
+echo "Testing GIT and KEY FILES..."
+echo "-----------------------------------------------------------------------"
+test_file "Block .git suffix" "/a/repo.git" 2
+test_file "Block .git directory" "/a/.git" 2
+test_file "Block file inside .git/" "/a/.git/config" 2
+test_file "Allow .gitignore" "/a/.gitignore" 0
+test_file "Allow .github workflow" "/a/.github/workflows/ci.yml" 0
+test_file "Block .pem" "/a/cert.pem" 2
+test_file "Block .key (uppercase)" "/a/server.KEY" 2
+test_file "Block .ssh/" "/home/u/.ssh/config" 2
+test_file "Block id_rsa" "/home/u/id_rsa.pub" 2
+test_file "Allow keys.json" "/a/keys.json" 0
+
+echo ""
+echo "Testing ENVIRONMENT FILES..."
+echo "-----------------------------------------------------------------------"
+test_file "Block .env" "/a/.env" 2
+test_file "Block .env (uppercase)" "/a/.ENV" 2
+test_file "Block .env.local" "/a/.env.local" 2
+test_file "Block prod.env" "/a/prod.env" 2
+test_file "Block file under .env.d/" "/a/.env.d/x" 2
+test_file "Allow .envrc" "/a/.envrc" 0
+test_file "Allow environment.ts" "/a/src/environment.ts" 0
+
+echo ""
+echo "Testing EXCEPTIONS (should allow with exit 0)..."
+echo "-----------------------------------------------------------------------"
+test_file "Allow .env.example" "/a/.env.example" 0
+test_file "Allow .env.sample" "/a/.env.sample" 0
+test_file "Allow .env.template" "/a/.env.template" 0
+test_file "Allow .ENV.EXAMPLE (uppercase)" "/a/.ENV.EXAMPLE" 0
+test_file "Allow .Env.Sample (mixed case)" "/a/.Env.Sample" 0
+test_file "Block .env.example.bak" "/a/.env.example.bak" 2
+
+echo ""
+echo "======================================================================="
+echo "Test suite complete!"
+echo "======================================================================="
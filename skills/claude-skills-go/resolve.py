@@ -13,45 +13,198 @@ Reads manifest.json and resolves matching skills based on:
 3. Content hints (regex on first 2000 chars if file exists)
 """
 
+import glob
 import json
+import os
+import pickle
 import re
 import sys
-from fnmatch import fnmatch
+import tempfile
+from fnmatch import translate
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+# Parsed manifests keyed by (manifest path, mtime_ns), shared across runs.
+# The file name is versioned: v2 entries hold only valid content hints.
+MANIFEST_CACHE = Path("~/.cache/claude-skills/manifest-v2.pkl").expanduser()
+
+# Files that never hold text worth matching content hints against
+BINARY_EXTENSIONS = frozenset(
+    (
+        ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".pdf",
+        ".zip", ".gz", ".tgz", ".tar", ".bz2", ".xz", ".7z",
+        ".so", ".dylib", ".dll", ".exe", ".o", ".a", ".wasm",
+        ".class", ".jar", ".pyc", ".woff", ".woff2", ".ttf", ".otf",
+        ".mp3", ".mp4", ".mov", ".wav",
+    )
+)
+
+# Backreferences depend on group numbering, which fusing patterns shifts
+BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Literal end of a glob: everything after its last wildcard or bracket
+GLOB_TAIL = re.compile(r"[^*?\[\]]*$")
+
+
+def read_manifest_cache() -> dict[tuple[str, int], dict]:
+    """Load the on-disk manifest cache; a missing or corrupt file is empty."""
+    try:
+        with MANIFEST_CACHE.open("rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def write_manifest_cache(cache: dict[tuple[str, int], dict]) -> None:
+    """Atomically replace the on-disk manifest cache; failures are ignored."""
+    try:
+        MANIFEST_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=MANIFEST_CACHE.parent, delete=False
+        ) as f:
+            pickle.dump(cache, f, protocol=5)
+        os.replace(f.name, MANIFEST_CACHE)
+    except OSError:
+        pass
+
+
+def drop_invalid_hints(hints: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Drop content hints that are not valid regexes, reporting each one."""
+    valid: dict[str, list[str]] = {}
+    for pattern, skill_patterns in hints.items():
+        try:
+            re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            print(f"Skipping invalid content hint {pattern!r}: {e}", file=sys.stderr)
+        else:
+            valid[pattern] = skill_patterns
+    return valid
+
+
+@lru_cache(maxsize=8)
+def load_manifest_cached(path: str, mtime_ns: int) -> dict:
+    """Parse a manifest, going through the pickle cache keyed by its mtime."""
+    cache = read_manifest_cache()
+    key = (path, mtime_ns)
+    if key in cache:
+        return cache[key]
+
+    with open(path, "rb") as f:
+        data: dict[str, Any] = json.loads(f.read())
+    if "content_hints" in data:
+        data["content_hints"] = drop_invalid_hints(data["content_hints"])
+
+    # Drop entries for older versions of this manifest
+    cache = {k: v for k, v in cache.items() if k[0] != path}
+    cache[key] = data
+    write_manifest_cache(cache)
+    return data
+
 
 def load_manifest(manifest_path: Path) -> dict:
     """Load and parse the manifest.json file."""
-    if not manifest_path.exists():
+    try:
+        mtime_ns = manifest_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {"always": [], "extensions": {}, "paths": {}, "content_hints": {}}
 
-    with manifest_path.open() as f:
-        data: dict[str, Any] = json.load(f)
-        return data
+    return load_manifest_cached(str(manifest_path), mtime_ns)
+
+
+@lru_cache(maxsize=512)
+def glob_skills(skills_dir: str, pattern: str, mtime_ns: int) -> tuple[str, ...]:
+    """Glob the skills directory; mtime_ns is part of the cache key only."""
+    # Same matches as Path.glob: "**" recurses and wildcards match dotfiles
+    matches = glob.glob(
+        pattern, root_dir=skills_dir, recursive=True, include_hidden=True
+    )
+    return tuple(os.path.normpath(os.path.join(skills_dir, match)) for match in matches)
 
 
-def resolve_glob_patterns(skills_dir: Path, patterns: list[str]) -> list[Path]:
-    """Resolve glob patterns to actual skill files."""
-    resolved: list[Path] = []
+def resolve_glob_patterns(skills_dir: str, patterns: list[str]) -> list[str]:
+    """
+    Resolve glob patterns to actual skill files.
+
+    Paths are normalised, so "./a/Skill.md", "a//Skill.md" and a glob match
+    of the same file deduplicate as one string.
+    """
+    resolved: list[str] = []
     for pattern in patterns:
         # Handle both glob patterns and direct file references
         if "*" in pattern:
-            resolved.extend(skills_dir.glob(pattern))
+            # Key the cached scan on the mtime of the directory the wildcard
+            # part starts in, so added or removed skills invalidate it
+            base = os.path.join(skills_dir, os.path.dirname(pattern.split("*", 1)[0]))
+            try:
+                mtime_ns = os.stat(base).st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+            resolved.extend(glob_skills(skills_dir, pattern, mtime_ns))
         else:
-            skill_path = skills_dir / pattern
-            if skill_path.exists():
+            skill_path = os.path.normpath(os.path.join(skills_dir, pattern))
+            if os.path.exists(skill_path):
                 resolved.append(skill_path)
     return resolved
 
 
-def get_file_content_sample(file_path: Path, max_chars: int = 2000) -> str:
-    """Read first N characters of a file for content hint matching."""
-    if not file_path.exists():
-        return ""
+@lru_cache(maxsize=8)
+def compile_content_hints(
+    patterns: tuple[str, ...],
+) -> tuple[re.Pattern[str] | None, list[re.Pattern[str]]]:
+    """
+    Compile content hint regexes once.
+
+    Also returns a prefilter fusing every valid hint into one alternation,
+    so content that matches no hint is rejected in a single scan. It is None
+    when the hints cannot be fused safely (backreferences, or inline flags
+    that are only valid at the start of a pattern).
+    """
+    # Every pattern was validated when the manifest was parsed
+    compiled = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
 
+    if not patterns or any(BACKREFERENCE.search(pattern) for pattern in patterns):
+        return None, compiled
     try:
-        with file_path.open(errors="ignore") as f:
+        prefilter = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    except re.error:
+        prefilter = None
+    return prefilter, compiled
+
+
+@lru_cache(maxsize=8)
+def compile_path_globs(
+    globs: tuple[str, ...],
+) -> tuple[
+    dict[str, list[tuple[int, re.Pattern[str]]]], list[tuple[int, re.Pattern[str]]]
+]:
+    """
+    Translate path globs to compiled regexes, bucketed by literal extension.
+
+    A glob whose literal tail (after its last wildcard) contains a dot, like
+    "**/*_test.go", only matches paths with the same text after their last
+    dot, so it is filed under that key ("go"); only globs without such a
+    tail are tried against every path. Entries are (index into globs, regex).
+    """
+    by_ext: dict[str, list[tuple[int, re.Pattern[str]]]] = {}
+    generic: list[tuple[int, re.Pattern[str]]] = []
+    for index, glob_pattern in enumerate(globs):
+        glob_pattern = os.path.normcase(glob_pattern)
+        entry = (index, re.compile(translate(glob_pattern)))
+        tail = GLOB_TAIL.search(glob_pattern).group()
+        if "." in tail:
+            by_ext.setdefault(tail.rpartition(".")[2], []).append(entry)
+        else:
+            generic.append(entry)
+    return by_ext, generic
+
+
+def get_file_content_sample(file_path: str, max_chars: int = 2000) -> str:
+    """Read first N characters of a file for content hint matching."""
+    # A missing file is just another OSError; no separate exists() check
+    try:
+        with open(file_path, errors="ignore") as f:
             return f.read(max_chars)
     except OSError:
         return ""
@@ -63,49 +216,66 @@ def resolve_skills(file_path: str) -> list[Path]:
 
     Returns deduplicated list of skill file paths.
     """
-    target = Path(file_path)
-    skills_dir = Path(__file__).parent
-    manifest = load_manifest(skills_dir / "manifest.json")
+    # Plain strings and os.path throughout; Path only for the result, so
+    # deduplication hashes strings rather than Path objects. The target goes
+    # through Path once: unlike os.path.normpath it keeps ".." components,
+    # which path globs such as "**/*_test.go" must still see.
+    target = str(Path(file_path))
+    skills_dir = os.path.dirname(os.path.abspath(__file__))
+    manifest = load_manifest(Path(skills_dir, "manifest.json"))
 
-    matched_skills: set[Path] = set()
+    matched_skills: set[str] = set()
 
     # 1. Always-loaded skills
     for pattern in manifest.get("always", []):
         for skill_file in resolve_glob_patterns(skills_dir, [pattern]):
-            if skill_file.suffix == ".md":
+            if skill_file.endswith(".md"):
                 matched_skills.add(skill_file)
 
     # 2. Extension-based skills
-    ext = target.suffix.lower()
+    ext = os.path.splitext(target)[1].lower()
     if ext in manifest.get("extensions", {}):
         patterns = manifest["extensions"][ext]
         for skill_file in resolve_glob_patterns(skills_dir, patterns):
-            if skill_file.suffix == ".md":
+            if skill_file.endswith(".md"):
                 matched_skills.add(skill_file)
 
-    # 3. Path-based skills
-    target_str = str(target)
-    for glob_pattern, skill_patterns in manifest.get("paths", {}).items():
-        if fnmatch(target_str, glob_pattern):
-            for skill_file in resolve_glob_patterns(skills_dir, skill_patterns):
-                if skill_file.suffix == ".md":
+    # Fast path: with no path glob for this extension, no generic glob and
+    # no content hint worth reading, the skills above are the whole answer
+    target_str = os.path.normcase(target)
+    paths = manifest.get("paths", {})
+    by_ext, generic = compile_path_globs(tuple(paths))
+    candidates = by_ext.get(target_str.rpartition(".")[2], [])
+    hints = manifest.get("content_hints", {})
+    check_hints = bool(hints) and ext not in BINARY_EXTENSIONS
+    if not (candidates or generic or check_hints):
+        return sorted(map(Path, matched_skills))
+
+    # 3. Path-based skills; only the globs that can match this path's
+    # extension, plus the generic ones, are tried
+    skill_lists = list(paths.values())
+    for index, regex in (*candidates, *generic):
+        if regex.match(target_str):
+            for skill_file in resolve_glob_patterns(skills_dir, skill_lists[index]):
+                if skill_file.endswith(".md"):
                     matched_skills.add(skill_file)
 
-    # 4. Content hint skills (only if file exists)
-    content = get_file_content_sample(target)
-    if content:
-        for regex_pattern, skill_patterns in manifest.get("content_hints", {}).items():
-            try:
-                if re.search(regex_pattern, content, re.IGNORECASE):
+    # 4. Content hint skills (only if file exists); the file is not read at
+    # all without a hint or when it is a known binary format
+    if check_hints:
+        prefilter, compiled = compile_content_hints(tuple(hints))
+        content = get_file_content_sample(target)
+        # One scan rules out content that matches no hint at all; only
+        # then is each hint confirmed on its own
+        if content and (prefilter is None or prefilter.search(content)):
+            for regex, skill_patterns in zip(compiled, hints.values()):
+                if regex.search(content):
                     for skill_file in resolve_glob_patterns(skills_dir, skill_patterns):
-                        if skill_file.suffix == ".md":
+                        if skill_file.endswith(".md"):
                             matched_skills.add(skill_file)
-            except re.error:
-                # Skip invalid regex patterns
-                continue
 
-    # Return sorted for consistent output
-    return sorted(matched_skills)
+    # Return sorted for consistent output (Path order, as before)
+    return sorted(map(Path, matched_skills))
 
 
 def main() -> int: